@@ -1,38 +1,77 @@
 from typing import Any
-from datetime import datetime
+from pathlib import Path
 
 from pymongo import MongoClient
+from pymongo.collection import Collection
 
+from src.core.clock import Clock, clock
 from src.core.config import settings
 
 
 class AppData:
-    def __init__(self):
-        self.client = MongoClient(settings.mongo_url)
+    """Posting state of every channel, keyed by channel name."""
+
+    def __init__(self, clock: Clock = clock):
+        self.clock = clock
+        self.client: MongoClient[dict[str, Any]] = MongoClient(settings.mongo_url)
         self.db = self.client[settings.MONGO_NAME]
-        self.app_data = self.db["app_data"]
+        self.app_data: Collection[dict[str, Any]] = self.db["app_data"]
 
-    def get(self) -> dict[str, Any]:
-        doc = self.app_data.find_one({"app_name": settings.APP_NAME})
+    def get(
+        self,
+        app_name: str = settings.APP_NAME,
+        *,
+        initial_frame: int = settings.INITIAL_FRAME
+    ) -> dict[str, Any]:
+        doc = self.app_data.find_one({"app_name": app_name})
         if doc is None:
             doc = {
-                "app_name": settings.APP_NAME,
-                "frame_index": settings.INITIAL_FRAME + 1,
-                "datetime": datetime.now()
+                "app_name": app_name,
+                "frame_index": initial_frame + 1,
+                "datetime": self.clock.now(),
+                "pending": []
             }
-            _ = self.app_data.insert_one(doc)  # pyright: ignore[reportUnknownMemberType]
+            _ = self.app_data.insert_one(doc)  # pyright: ignore[reportUnknownArgumentType]
 
         return doc
 
-    def increment_frame_index(self) -> None:
+    def increment_frame_index(self, app_name: str = settings.APP_NAME, count: int = 1) -> None:
         _ = self.app_data.update_one(
-            {"app_name": settings.APP_NAME},
+            {"app_name": app_name},
             {
-                "$inc": {"frame_index": 1},
-                "$set": {"datetime": datetime.now()}
+                "$inc": {"frame_index": count},
+                "$set": {"datetime": self.clock.now()}
             },
             upsert=False
         )
 
+    def push_pending_post(
+        self,
+        app_name: str = settings.APP_NAME,
+        *,
+        path: Path,
+        msg: str,
+        uncertain: bool = False
+    ) -> None:
+        _ = self.app_data.update_one(
+            {"app_name": app_name},
+            {"$push": {"pending": {"path": str(path), "msg": msg, "attempts": 1, "uncertain": uncertain}}},
+            upsert=False
+        )
+
+    def increment_pending_attempts(self, app_name: str = settings.APP_NAME, *, uncertain: bool = False) -> None:
+        update: dict[str, Any] = {"$inc": {"pending.0.attempts": 1}}
+        if uncertain:
+            update["$set"] = {"pending.0.uncertain": True}
+
+        _ = self.app_data.update_one({"app_name": app_name}, update, upsert=False)
+
+    def pop_pending_post(self, app_name: str = settings.APP_NAME) -> None:
+        _ = self.app_data.update_one(
+            {"app_name": app_name},
+            {"$pop": {"pending": -1}},
+            upsert=False
+        )
+
 
 app_data = AppData()
@@ -0,0 +1,13 @@
+from time import sleep
+from datetime import datetime
+
+
+class Clock:
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def sleep(self, seconds: float) -> None:
+        sleep(seconds)
+
+
+clock = Clock()
@@ -1,7 +1,7 @@
 import os
 from pathlib import Path
 
-from pydantic import computed_field
+from pydantic import BaseModel, computed_field
 from pydantic_core import Url
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,6 +10,9 @@ class SaluteSpeechSettings(BaseSettings):
     SALUTE_SPEECH_SCOPE: str
     SALUTE_SPEECH_AUTH_KEY: str
 
+    SALUTE_SPEECH_OAUTH_URL: str = "https://ngw.devices.sberbank.ru:9443/api/v2/oauth"
+    SALUTE_SPEECH_RECOGNIZE_URL: str = "https://smartspeech.sber.ru/rest/v1/speech:recognize"
+
 
 class MongoSettings(BaseSettings):
     MONGO_ENGINE: str
@@ -29,6 +32,19 @@ class MongoSettings(BaseSettings):
         ))
 
 
+class ChannelSettings(BaseModel):
+    name: str
+
+    vk_group_id: int
+
+    post_delay_in_seconds: int = 1800
+    initial_frame: int = 0
+
+    playlist: list[Path]
+    frame_output_path: Path
+    changed_output_path: Path
+
+
 class Settings(
     MongoSettings,
     SaluteSpeechSettings
@@ -43,11 +59,22 @@ class Settings(
 
     LOG_LEVEL: str
 
-    VIDEO_FILE_PATH: Path
+    VIDEO_FILE_PATH: Path | None = None
+    # JSON list of episode files played one after another; overrides VIDEO_FILE_PATH
+    PLAYLIST: list[Path] = []
     FRAME_OUTPUT_PATH: Path
     CHANGED_OUTPUT_PATH: Path
     IMPACT_FONT_PATH: Path
 
+    # JSON list of channels; when empty the single channel above is used
+    CHANNELS: list[ChannelSettings] = []
+    WORKERS: int = 4
+
+    # Upper bounds for every external call of a single post
+    FFMPEG_DEADLINE_IN_SECONDS: int = 60
+    STT_DEADLINE_IN_SECONDS: int = 30
+    VK_DEADLINE_IN_SECONDS: int = 60
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", ".env"),
         env_file_encoding="utf-8",
@@ -55,5 +82,29 @@ class Settings(
         extra="ignore",
     )
 
+    @property
+    def playlist(self) -> list[Path]:
+        if self.PLAYLIST:
+            return self.PLAYLIST
+        if self.VIDEO_FILE_PATH is not None:
+            return [self.VIDEO_FILE_PATH]
+
+        raise ValueError("Either VIDEO_FILE_PATH or PLAYLIST must be set")
+
+    @property
+    def channels(self) -> list[ChannelSettings]:
+        if self.CHANNELS:
+            return self.CHANNELS
+
+        return [ChannelSettings(
+            name=self.APP_NAME,
+            vk_group_id=self.VK_GROUP_ID,
+            post_delay_in_seconds=self.POST_DELAY_IN_SECONDS,
+            initial_frame=self.INITIAL_FRAME,
+            playlist=self.playlist,
+            frame_output_path=self.FRAME_OUTPUT_PATH,
+            changed_output_path=self.CHANGED_OUTPUT_PATH
+        )]
+
 
 settings = Settings()
@@ -15,3 +15,18 @@ class VkConnectionError(Exception):
         self.message = message
 
         super().__init__(f"Error: {message}.")
+
+
+class StageTimeoutError(Exception):
+    def __init__(self, stage: str, deadline: float) -> None:
+        self.stage = stage
+        self.deadline = deadline
+
+        super().__init__(f"Error: {stage} missed its deadline of {deadline} seconds.")
+
+
+class PostOutcomeUnknownError(Exception):
+    def __init__(self, msg: str) -> None:
+        self.msg = msg
+
+        super().__init__(f"Error: VK timed out, post {msg!r} may have been published.")
@@ -0,0 +1,54 @@
+from typing import Any
+from threading import Lock
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import structlog
+
+from src.core.config import settings
+from src.core.exceptions import StageTimeoutError
+
+
+LOGGER = structlog.get_logger(__name__)
+
+
+class Supervisor:
+    """
+    Runs blocking calls of one pipeline stage on worker threads and gives up
+    on calls that miss their deadline. A worker stuck in such a call is
+    abandoned together with its pool and later calls get fresh workers.
+    """
+
+    def __init__(self, stage: str, workers: int = settings.WORKERS) -> None:
+        self.stage = stage
+        self.workers = workers
+        self.lock = Lock()
+        self.executor = self._create_executor()
+
+    def _create_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.stage)
+
+    def _restart(self, executor: ThreadPoolExecutor) -> None:
+        with self.lock:
+            if self.executor is not executor:
+                return  # already restarted by another caller
+            self.executor = self._create_executor()
+
+        executor.shutdown(wait=False)
+        LOGGER.warning("Workers restarted", stage=self.stage)
+
+    def run[T](self, fn: Callable[..., T], /, *args: Any, deadline: float, **kwargs: Any) -> T:
+        with self.lock:
+            executor = self.executor
+
+        future = executor.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=deadline)
+        except TimeoutError as e:
+            if future.done():
+                raise  # raised by fn itself
+
+            LOGGER.error("Stage missed its deadline", stage=self.stage, deadline=deadline)
+            if not future.cancel():
+                self._restart(executor)
+            raise StageTimeoutError(self.stage, deadline) from e
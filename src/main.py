@@ -1,23 +1,44 @@
+import argparse
+
 import structlog
 
 from src.core import logger  # init logger # pyright: ignore
 from src.core.config import settings
-from src.poster import Poster
+from src.scheduler import Scheduler
 
 
 LOGGER = structlog.get_logger(__name__)
 
 
-def main():
-    LOGGER.info("APPLICATION STARTED")
-    p = Poster(
-        video_path=settings.VIDEO_FILE_PATH,
-        output_path=settings.FRAME_OUTPUT_PATH,
-        second_output_path=settings.CHANGED_OUTPUT_PATH,
-        font_path=settings.IMPACT_FONT_PATH,
-        delay_in_seconds=settings.POST_DELAY_IN_SECONDS
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    _ = parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="run offline against local stand-ins for VK, SaluteSpeech and Mongo"
     )
-    p.posting()
+    _ = parser.add_argument("--days", type=float, default=30, help="simulated days of posting")
+    _ = parser.add_argument("--vk-failure-rate", type=float, default=0.0)
+    _ = parser.add_argument("--stt-failure-rate", type=float, default=0.0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.simulate:
+        from src.simulation.runner import simulate
+
+        LOGGER.info("SIMULATION STARTED", days=args.days)
+        simulate(
+            days=args.days,
+            vk_failure_rate=args.vk_failure_rate,
+            stt_failure_rate=args.stt_failure_rate
+        )
+        return
+
+    LOGGER.info("APPLICATION STARTED", channels=[c.name for c in settings.channels])
+    Scheduler(settings.channels).run()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,26 @@
+import shutil
+from typing import Any, Self
+from types import TracebackType
 from datetime import datetime
-from time import sleep
 from pathlib import Path
+from dataclasses import dataclass
+from collections.abc import Callable
+from concurrent.futures import Executor
 
 import structlog
+from cv2.typing import MatLike
 
-from src.core.exceptions import RecognitionError, VkConnectionError
-from src.app_data import app_data
-from src.vk_api_wrapper import upload_photo, wall_post
+from src.core.exceptions import (
+    PostOutcomeUnknownError,
+    RecognitionError,
+    StageTimeoutError,
+    VkConnectionError
+)
+from src.core.clock import Clock, clock
+from src.core.config import settings
+from src.app_data import AppData, app_data
+from src.vk_api_wrapper import VkWall, vk_wall
+from src.speech_recognition import SpeechRecognizer, speech_recognizer
 from src.video_frame import (
     image_difference,
     Video,
@@ -19,105 +33,241 @@ from src.image import ImageTextComposer
 LOGGER = structlog.get_logger(__name__)
 
 
+@dataclass
+class PendingPost:
+    path: Path
+    msg: str
+    attempts: int
+    # VK timed out on wall.post, so the post may already be on the wall
+    uncertain: bool = False
+
+
 class Poster:
+    RETRY_DELAY_IN_SECONDS = 60
+    # VkConnectionError wraps permanent errors too, so a post that is still
+    # rejected after about an hour of retries is dropped
+    MAX_POST_ATTEMPTS = 60
+
+    # Share of equal pixels between scan thumbnails (in %) above which a frame
+    # counts as the same. Calibrated against the old full frame vs JPEG check:
+    # it keeps every frame the old 5% posted and matches the old 20% exactly
+    MINIMAL_IMAGE_DIFFERENCE = 3
+    MINIMAL_IMAGE_DIFFERENCE_WITHOUT_SPEECH = 26
+
     @property
     def frame_index(self):
-        return app_data.get()["frame_index"]
+        return self._state()["frame_index"]
+
+    @property
+    def pending_posts(self) -> list[PendingPost]:
+        """Posts VK failed to accept, pushed in order before any new frame."""
+        return [
+            PendingPost(
+                path=Path(post["path"]),
+                msg=post["msg"],
+                attempts=post["attempts"],
+                uncertain=post.get("uncertain", False)
+            )
+            for post in self._state().get("pending", [])
+        ]
 
     def __init__(
         self,
         *,
-        video_path: Path,
+        video_paths: list[Path],
         output_path: Path,
         second_output_path: Path,
         font_path: Path,
-        delay_in_seconds: int
+        delay_in_seconds: int,
+        app_name: str = settings.APP_NAME,
+        initial_frame: int = settings.INITIAL_FRAME,
+        app_data: AppData = app_data,
+        vk_wall: VkWall = vk_wall,
+        speech_recognizer: SpeechRecognizer = speech_recognizer,
+        clock: Clock = clock,
+        cpu_executor: Executor | None = None
     ) -> None:
-        self.video = Video(video_path)
+        self.video = Video(video_paths)
+        self.app_name = app_name
+        self.initial_frame = initial_frame
+        self.app_data = app_data
+        self.vk_wall = vk_wall
+        self.speech_recognizer = speech_recognizer
+        self.clock = clock
+        # Decoding and composing run here, waits for ffmpeg, STT and VK don't
+        self.cpu_executor = cpu_executor
 
         self.output_path = output_path
         self.second_output_path = second_output_path
         self.font_path = font_path
         self.delay_in_seconds = delay_in_seconds
 
-        self.minimal_image_difference = 5  # in %
+        self.minimal_image_difference = self.MINIMAL_IMAGE_DIFFERENCE
+        # Scan sized thumbnail of the last posted frame
+        self.last_posted: MatLike | None = None
         self.frame_count: int = self.video.frame_count
-        self.fps: int = self.video.fps
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        type_: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        self.close()
+
+    def close(self) -> None:
+        self.video.close()
+
+    def _on_cpu[T](self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        if self.cpu_executor is None:
+            return fn(*args, **kwargs)
+        return self.cpu_executor.submit(fn, *args, **kwargs).result()
+
+    def _state(self) -> dict[str, Any]:
+        return self.app_data.get(self.app_name, initial_frame=self.initial_frame)
+
+    def seconds_until_next_post(self) -> float:
+        if self.pending_posts:
+            return self.RETRY_DELAY_IN_SECONDS
+
+        date: datetime = self._state()["datetime"]
+        time_diff = (self.clock.now() - date).total_seconds()
+        return self.delay_in_seconds - time_diff
 
     def _sleep(self) -> None:
-        date: datetime = app_data.get()["datetime"]
-        time_diff = (datetime.now() - date).total_seconds()
-        delay = self.delay_in_seconds - time_diff
+        delay = self.seconds_until_next_post()
 
         if delay < 0:
             LOGGER.info("Skip", seconds=delay)
         else:
             LOGGER.info("Sleeping", seconds=delay)
-            sleep(delay)
+            self.clock.sleep(delay)
 
-    def _post(self, *, path: Path) -> None:
-        attachment = upload_photo(str(path))[0]
-        index: int = self.frame_index
+    def _post(self, *, path: Path, msg: str) -> None:
+        attachment = self.vk_wall.upload_photo(str(path))[0]
 
-        wall_post(
-            msg=f"{index} из {self.frame_count} кадров",
-            attachments=attachment
-        )
+        try:
+            self.vk_wall.wall_post(
+                msg=msg,
+                attachments=attachment
+            )
+        except StageTimeoutError as e:
+            raise PostOutcomeUnknownError(msg) from e
 
-    def _speeched_post(self) -> None:
+    def _speeched_post(self) -> bool:
         text = get_speech_from_video(
+            video=self.video,
             prev_frame=self.frame_index-500, 
             newest_frame=self.frame_index,
-            fps=self.fps
+            speech_recognizer=self.speech_recognizer
         )
-        if text is not None:
-            composer = ImageTextComposer(font_path=self.font_path)
-            composer.compose(text=text, input_path=self.output_path, output_path=self.second_output_path)
+        if text is None:
+            return False
 
-    def _push_cached(self, *, path: Path) -> None:
-        LOGGER.info("Pushing cached post")
-        while True:
+        self._on_cpu(self._compose, text)
+        return True
+
+    def _compose(self, text: str) -> None:
+        composer = ImageTextComposer(font_path=self.font_path)
+        composer.compose(text=text, input_path=self.output_path, output_path=self.second_output_path)
+
+    def _defer(self, *, path: Path, msg: str, index: int, uncertain: bool) -> None:
+        # The output files are overwritten by the next frame, so keep a copy
+        pending = path.with_name(f"{path.stem}.pending{index}{path.suffix}")
+        _ = shutil.copyfile(path, pending)
+        self.app_data.push_pending_post(self.app_name, path=pending, msg=msg, uncertain=uncertain)
+        LOGGER.info("Post deferred", queued=len(self.pending_posts))
+
+    def _drop_pending(self, post: PendingPost) -> None:
+        self.app_data.pop_pending_post(self.app_name)
+        post.path.unlink(missing_ok=True)
+
+    def _push_cached(self) -> None:
+        LOGGER.info("Pushing cached posts", queued=len(self.pending_posts))
+        while pending_posts := self.pending_posts:
+            post = pending_posts[0]
             try:
-                self._post(path=path)
-            except:
-                sleep(60)  # minute sleeping and trying again
-            else:
-                LOGGER.info("Successfully pushed")
+                if post.uncertain and self.vk_wall.has_post(post.msg):
+                    LOGGER.info("Deferred post is already published", msg=post.msg)
+                    self._drop_pending(post)
+                    continue
+
+                self._post(path=post.path, msg=post.msg)
+            except (VkConnectionError, StageTimeoutError, PostOutcomeUnknownError) as e:
+                if post.attempts + 1 >= self.MAX_POST_ATTEMPTS:
+                    LOGGER.error("Post dropped", msg=post.msg, attempts=post.attempts + 1)
+                    self._drop_pending(post)
+                else:
+                    self.app_data.increment_pending_attempts(
+                        self.app_name,
+                        uncertain=isinstance(e, PostOutcomeUnknownError)
+                    )
+                    LOGGER.info("VK is still unavailable", queued=len(pending_posts))
                 return
 
-    def posting(self):
+            self._drop_pending(post)
+            LOGGER.info("Successfully pushed")
+
+    def _next_frame(self, index: int) -> int:
+        """Skip frames similar to the last posted one, save the next one and return its index."""
         while True:
-            path: Path = self.output_path
+            if self.last_posted is None and index > 0 and does_file_exist(self.output_path):
+                self.last_posted = self.video.get_thumbnail_by_index(index - 1).copy()
 
-            frame = self.video.get_frame_by_index(self.frame_index)
+            thumbnail = self.video.get_thumbnail_by_index(index)
 
-            if does_file_exist(self.output_path):
-                newest_frame = self.video.read_frame(path=self.output_path)
-                image_diff = image_difference(frame, newest_frame)
+            if self.last_posted is not None:
+                image_diff = image_difference(thumbnail, self.last_posted)
                 if image_diff > self.minimal_image_difference:  # IF IMAGES ARE MOSTLY LIKE THE SAME WE SKIP
                     LOGGER.info("Images are same")
-                    app_data.increment_frame_index()
+                    index += 1
                     continue
 
+            self.last_posted = thumbnail.copy()
+
+            # Only the frame that actually gets posted is decoded at full resolution
+            frame = self.video.get_frame_by_index(index)
             self.video.save_frame_into_file(path=self.output_path, frame=frame)
+            return index
 
+    def post_next(self) -> None:
+        # Deferred posts go out first, new frames wait for the next slot
+        if self.pending_posts:
+            self._push_cached()
+            return
 
-            try:
-                self._speeched_post()
-            except RecognitionError:
-                self.minimal_image_difference = 20
-                LOGGER.info("All tokens left I suppose so we post without text")
-            else:
-                self.minimal_image_difference = 5
-                path = self.second_output_path
+        path: Path = self.output_path
+        start: int = self.frame_index
+        index = self._on_cpu(self._next_frame, start)
+        if index > start:
+            self.app_data.increment_frame_index(self.app_name, index - start)
 
 
-            try:
-                self._post(path=path)
-            except VkConnectionError:
-                self._push_cached(path=path)
-            finally:
-                app_data.increment_frame_index()
+        try:
+            captioned = self._speeched_post()
+        except (RecognitionError, StageTimeoutError):
+            self.minimal_image_difference = self.MINIMAL_IMAGE_DIFFERENCE_WITHOUT_SPEECH
+            LOGGER.info("All tokens left I suppose so we post without text")
+        else:
+            self.minimal_image_difference = self.MINIMAL_IMAGE_DIFFERENCE
+            if captioned:
+                path = self.second_output_path
+
 
+        msg = f"{index} из {self.frame_count} кадров"
+        try:
+            self._post(path=path, msg=msg)
+        except (VkConnectionError, StageTimeoutError):
+            self._defer(path=path, msg=msg, index=index, uncertain=False)
+        except PostOutcomeUnknownError:
+            self._defer(path=path, msg=msg, index=index, uncertain=True)
+        finally:
+            self.app_data.increment_frame_index(self.app_name)
 
+    def posting(self):
+        while True:
+            self.post_next()
             self._sleep()
@@ -0,0 +1,102 @@
+import asyncio
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import structlog
+
+from src.core.clock import Clock, clock
+from src.core.config import ChannelSettings, settings
+from src.app_data import AppData, app_data
+from src.vk_api_wrapper import VkWall
+from src.poster import Poster
+
+
+LOGGER = structlog.get_logger(__name__)
+
+
+class Scheduler:
+    """
+    Runs every channel in one asyncio loop. Waiting between posts costs
+    nothing, decoding and composing go to a bounded pool of worker threads.
+    The rest of a post, waiting for ffmpeg, SaluteSpeech and VK, runs on a
+    thread of its channel, so a slow service never holds a decoding worker.
+    """
+
+    RETRY_DELAY_IN_SECONDS = 60
+
+    def __init__(
+        self,
+        channels: list[ChannelSettings],
+        *,
+        workers: int = settings.WORKERS,
+        font_path: Path = settings.IMPACT_FONT_PATH,
+        app_data: AppData = app_data,
+        clock: Clock = clock
+    ) -> None:
+        self.channels = channels
+        self.font_path = font_path
+        self.app_data = app_data
+        self.clock = clock
+
+        self.cpu_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu")
+        # At most one post of every channel is in flight
+        self.channel_executor = ThreadPoolExecutor(
+            max_workers=max(len(channels), 1),
+            thread_name_prefix="channel"
+        )
+
+    def _create_poster(self, channel: ChannelSettings) -> Poster:
+        return Poster(
+            video_paths=channel.playlist,
+            output_path=channel.frame_output_path,
+            second_output_path=channel.changed_output_path,
+            font_path=self.font_path,
+            delay_in_seconds=channel.post_delay_in_seconds,
+            app_name=channel.name,
+            initial_frame=channel.initial_frame,
+            app_data=self.app_data,
+            vk_wall=VkWall(group_id=channel.vk_group_id),
+            clock=self.clock,
+            cpu_executor=self.cpu_executor
+        )
+
+    async def _run_channel(self, channel: ChannelSettings) -> None:
+        loop = asyncio.get_running_loop()
+        log = LOGGER.bind(channel=channel.name)
+
+        poster: Poster | None = None
+        while poster is None:
+            try:
+                poster = await loop.run_in_executor(self.channel_executor, self._create_poster, channel)
+            except Exception:
+                log.exception("Channel failed to start", retry_in=self.RETRY_DELAY_IN_SECONDS)
+                await asyncio.sleep(self.RETRY_DELAY_IN_SECONDS)
+        log.info("Channel started", files=len(channel.playlist))
+
+        with poster:
+            while True:
+                try:
+                    await loop.run_in_executor(self.channel_executor, poster.post_next)
+                    delay = max(
+                        await loop.run_in_executor(self.channel_executor, poster.seconds_until_next_post),
+                        0
+                    )
+                except Exception:
+                    log.exception("Posting failed", retry_in=self.RETRY_DELAY_IN_SECONDS)
+                    delay = self.RETRY_DELAY_IN_SECONDS
+                else:
+                    log.info("Sleeping", seconds=delay)
+
+                await asyncio.sleep(delay)
+
+    async def run_async(self) -> None:
+        async with asyncio.TaskGroup() as tg:
+            for channel in self.channels:
+                _ = tg.create_task(self._run_channel(channel), name=channel.name)
+
+    def run(self) -> None:
+        try:
+            asyncio.run(self.run_async())
+        finally:
+            self.channel_executor.shutdown(wait=False, cancel_futures=True)
+            self.cpu_executor.shutdown(wait=False, cancel_futures=True)
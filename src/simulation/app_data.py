@@ -0,0 +1,60 @@
+from typing import Any, override
+from pathlib import Path
+
+from src.app_data import AppData
+from src.core.clock import Clock, clock
+from src.core.config import settings
+
+
+class InMemoryAppData(AppData):
+    def __init__(self, clock: Clock = clock, frame_index: int | None = None):
+        self.clock = clock
+        self.frame_index = frame_index
+        self.docs: dict[str, dict[str, Any]] = {}
+
+    @override
+    def get(
+        self,
+        app_name: str = settings.APP_NAME,
+        *,
+        initial_frame: int = settings.INITIAL_FRAME
+    ) -> dict[str, Any]:
+        if app_name not in self.docs:
+            frame_index = initial_frame + 1 if self.frame_index is None else self.frame_index
+            self.docs[app_name] = {
+                "app_name": app_name,
+                "frame_index": frame_index,
+                "datetime": self.clock.now(),
+                "pending": []
+            }
+
+        return self.docs[app_name]
+
+    @override
+    def increment_frame_index(self, app_name: str = settings.APP_NAME, count: int = 1) -> None:
+        doc = self.get(app_name)
+        doc["frame_index"] += count
+        doc["datetime"] = self.clock.now()
+
+    @override
+    def push_pending_post(
+        self,
+        app_name: str = settings.APP_NAME,
+        *,
+        path: Path,
+        msg: str,
+        uncertain: bool = False
+    ) -> None:
+        self.get(app_name)["pending"].append(
+            {"path": str(path), "msg": msg, "attempts": 1, "uncertain": uncertain}
+        )
+
+    @override
+    def increment_pending_attempts(self, app_name: str = settings.APP_NAME, *, uncertain: bool = False) -> None:
+        post = self.get(app_name)["pending"][0]
+        post["attempts"] += 1
+        post["uncertain"] = post["uncertain"] or uncertain
+
+    @override
+    def pop_pending_post(self, app_name: str = settings.APP_NAME) -> None:
+        _ = self.get(app_name)["pending"].pop(0)
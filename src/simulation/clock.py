@@ -0,0 +1,19 @@
+from typing import override
+from datetime import datetime, timedelta
+
+from src.core.clock import Clock
+
+
+class VirtualClock(Clock):
+    def __init__(self, start: datetime | None = None) -> None:
+        self._now = start or datetime.now()
+        self.slept_seconds = 0.0
+
+    @override
+    def now(self) -> datetime:
+        return self._now
+
+    @override
+    def sleep(self, seconds: float) -> None:
+        self._now += timedelta(seconds=seconds)
+        self.slept_seconds += seconds
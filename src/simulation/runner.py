@@ -0,0 +1,68 @@
+from time import perf_counter
+from pathlib import Path
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+
+import structlog
+
+from src.core.config import settings
+from src.poster import Poster
+from src.speech_recognition import SpeechRecognizer
+from src.simulation.app_data import InMemoryAppData
+from src.simulation.clock import VirtualClock
+from src.simulation.speech_server import CannedSpeechServer
+from src.simulation.vk import VkRecorder
+
+
+LOGGER = structlog.get_logger(__name__)
+
+
+def simulate(*, days: float, vk_failure_rate: float = 0.0, stt_failure_rate: float = 0.0) -> None:
+    """
+    Replay `days` of posting against local stand-ins for VK, SaluteSpeech
+    and Mongo, with a virtual clock instead of real sleeping.
+    """
+    clock = VirtualClock()
+    start = clock.now()
+    end = start + timedelta(days=days)
+
+    app_data = InMemoryAppData(clock=clock)
+    vk = VkRecorder(clock=clock, failure_rate=vk_failure_rate)
+
+    # Never touch the frames of the live channel or the real SaluteSpeech
+    with (
+        CannedSpeechServer(failure_rate=stt_failure_rate) as speech_server,
+        TemporaryDirectory(prefix="simulation") as output_dir,
+        Poster(
+            video_paths=settings.playlist,
+            output_path=Path(output_dir) / f"frame{settings.FRAME_OUTPUT_PATH.suffix}",
+            second_output_path=Path(output_dir) / f"changed{settings.CHANGED_OUTPUT_PATH.suffix}",
+            font_path=settings.IMPACT_FONT_PATH,
+            delay_in_seconds=settings.POST_DELAY_IN_SECONDS,
+            app_data=app_data,
+            vk_wall=vk,
+            speech_recognizer=SpeechRecognizer(
+                oauth_url=speech_server.oauth_url,
+                recognize_url=speech_server.recognize_url
+            ),
+            clock=clock
+        ) as p
+    ):
+        started_at = perf_counter()
+        while clock.now() < end and p.frame_index < p.frame_count:
+            p.post_next()
+            clock.sleep(max(p.seconds_until_next_post(), 0))
+        elapsed = perf_counter() - started_at
+
+    LOGGER.info(
+        "SIMULATION FINISHED",
+        virtual_days=(clock.now() - start) / timedelta(days=1),
+        wall_seconds=elapsed,
+        posts=len(vk.posts),
+        posts_per_second=len(vk.posts) / elapsed if elapsed else 0.0,
+        frame_index=p.frame_index,
+        vk_failures=vk.failures,
+        stt_requests=speech_server.requests,
+        stt_failures=speech_server.failures,
+        slept_seconds=clock.slept_seconds
+    )
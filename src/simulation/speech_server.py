@@ -0,0 +1,106 @@
+import json
+import random
+from typing import Any, Self, override
+from time import time
+from types import TracebackType
+from itertools import cycle
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import structlog
+
+
+LOGGER = structlog.get_logger(__name__)
+
+
+CANNED_TRANSCRIPTS = [
+    "Так, все на кухню, через десять минут открываемся",
+    "Кто опять трогал мой нож, я же просил ничего не брать",
+    "Сеня, где заказ на третий столик, гости уже полчаса ждут",
+    "Шеф, у нас закончились креветки, что подавать вместо них",
+    "Лёва, убери отсюда свою гитару, это кухня, а не концертный зал",
+]
+
+
+class CannedSpeechServer:
+    """
+    Local stand-in for SaluteSpeech: hands out tokens and answers every
+    recognition request with the next canned transcript.
+    """
+
+    def __init__(
+        self,
+        transcripts: list[str] = CANNED_TRANSCRIPTS,
+        failure_rate: float = 0.0,
+        seed: int = 0
+    ) -> None:
+        self.transcripts = cycle(transcripts)
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+        self.requests = 0
+        self.failures = 0
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def oauth_url(self) -> str:
+        return f"{self.url}/oauth"
+
+    @property
+    def recognize_url(self) -> str:
+        return f"{self.url}/recognize"
+
+    def _respond(self, path: str) -> tuple[int, dict[str, Any]]:
+        if path == "/oauth":
+            # SaluteSpeech reports expiration in milliseconds
+            return 200, {"access_token": "simulated", "expires_at": int((time() + 1800) * 1000)}
+
+        self.requests += 1
+        if self.random.random() < self.failure_rate:
+            self.failures += 1
+            LOGGER.info("Simulated STT failure", failures=self.failures)
+            return 500, {"status": 500, "message": "Simulated failure"}
+
+        return 200, {"result": [next(self.transcripts)]}
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                _ = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, body = server._respond(self.path.split("?")[0])
+                payload = json.dumps(body, ensure_ascii=False).encode()
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                _ = self.wfile.write(payload)
+
+            @override
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> Self:
+        self.thread.start()
+        LOGGER.info("Canned speech server started", url=self.url)
+        return self
+
+    def __exit__(
+        self,
+        type_: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        self.server.shutdown()
+        self.server.server_close()
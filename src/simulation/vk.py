@@ -0,0 +1,62 @@
+import random
+from typing import override
+from dataclasses import dataclass
+from datetime import datetime
+
+import structlog
+
+from src.core.clock import Clock, clock
+from src.core.config import settings
+from src.core.exceptions import VkConnectionError
+from src.vk_api_wrapper import VkWall
+
+
+LOGGER = structlog.get_logger(__name__)
+
+
+@dataclass
+class RecordedPost:
+    group_id: int
+    datetime: datetime
+    msg: str
+    attachments: str
+
+
+class VkRecorder(VkWall):
+    def __init__(
+        self,
+        group_id: int = settings.VK_GROUP_ID,
+        clock: Clock = clock,
+        failure_rate: float = 0.0,
+        seed: int = 0
+    ) -> None:
+        self.group_id = group_id
+        self.clock = clock
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+        self.posts: list[RecordedPost] = []
+        self.uploads: list[str] = []
+        self.failures = 0
+
+    def _maybe_fail(self) -> None:
+        if self.random.random() < self.failure_rate:
+            self.failures += 1
+            LOGGER.info("Simulated VK failure", failures=self.failures)
+            raise VkConnectionError("Simulated connection error")
+
+    @override
+    def wall_post(self, *, msg: str, attachments: str) -> None:
+        self._maybe_fail()
+        self.posts.append(RecordedPost(self.group_id, self.clock.now(), msg, attachments))
+
+    @override
+    def upload_photo(self, direc: str) -> list[str]:
+        self._maybe_fail()
+        self.uploads.append(direc)
+        return [f"photo{self.group_id}_{len(self.uploads)}"]
+
+    @override
+    def has_post(self, msg: str) -> bool:
+        self._maybe_fail()
+        return any(post.msg == msg for post in self.posts)
@@ -1,34 +1,45 @@
 import uuid
 import requests
 from time import time
+from threading import Lock
 from urllib.parse import urlencode
 
 import structlog
+from requests.adapters import HTTPAdapter
 
 from src.core.config import settings
 from src.core.exceptions import RecognitionError
+from src.core.supervisor import Supervisor
 
 
 LOGGER = structlog.get_logger(__file__)
 
 
+# Shared by every channel so connections to SaluteSpeech are reused
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_maxsize=settings.WORKERS))
+
+
 class TokenManager:
-    def __init__(self) -> None:
+    def __init__(self, oauth_url: str = settings.SALUTE_SPEECH_OAUTH_URL) -> None:
+        self.oauth_url = oauth_url
         self.token: str | None = None
         self.token_expire: int | None = None
+        self.lock = Lock()
 
     def get_token(self) -> str:
-        if self.token is None or self.token_expire is None \
-                or self.token_expire <= time():
-            self.token, self.token_expire = self._refresh_token()
+        with self.lock:
+            if self.token is None or self.token_expire is None \
+                    or self.token_expire <= time():
+                self.token, self.token_expire = self._refresh_token()
 
-        return self.token
+            return self.token
 
     def _refresh_token(self) -> tuple[str, int]:
         scope = settings.SALUTE_SPEECH_SCOPE
         auth_key = settings.SALUTE_SPEECH_AUTH_KEY
 
-        url = "https://ngw.devices.sberbank.ru:9443/api/v2/oauth"
+        url = self.oauth_url
 
         headers = {
             'Content-Type': 'application/x-www-form-urlencoded',
@@ -41,36 +52,67 @@ class TokenManager:
             "scope": scope
         })
 
-        response = requests.post(url, verify=False, headers=headers, data=data)
+        try:
+            response = _http.post(
+                url, verify=False, headers=headers, data=data,
+                timeout=settings.STT_DEADLINE_IN_SECONDS
+            )
+        except requests.RequestException as e:
+            LOGGER.error("Sberbank is unreachable", url=url, error=str(e))
+            raise RecognitionError(url, {"scope": scope}, "Sberbank is unreachable") from e
+
         if response.status_code != 200:
             LOGGER.error("Request to sberbank went wrong!", url=url, headers=headers, data=data)
-            raise Exception("Request to sberbank went wrong!")
+            raise RecognitionError(url, {"scope": scope}, "Request to sberbank went wrong!")
 
         json = response.json()
         return json["access_token"], int(json["expires_at"])
 
 
-_token_manager = TokenManager()
+_supervisor = Supervisor("stt")
+
+
+class SpeechRecognizer:
+    def __init__(
+        self,
+        *,
+        oauth_url: str = settings.SALUTE_SPEECH_OAUTH_URL,
+        recognize_url: str = settings.SALUTE_SPEECH_RECOGNIZE_URL
+    ) -> None:
+        self.recognize_url = recognize_url
+        self.token_manager = TokenManager(oauth_url)
+
+    def get_speech(self, *, ogg_data: bytes) -> list[str]:
+        return _supervisor.run(self._recognize, ogg_data, deadline=settings.STT_DEADLINE_IN_SECONDS)
+
+    def _recognize(self, ogg_data: bytes) -> list[str]:
+        token = self.token_manager.get_token()
 
-def get_speech(*, ogg_data: bytes) -> list[str]:
-    token = _token_manager.get_token()
+        url = self.recognize_url
 
-    url = "https://smartspeech.sber.ru/rest/v1/speech:recognize"
+        params = {
+            "enable_profanity_filter": False
+        }
+        headers = {
+            "Content-Type": "audio/ogg;codecs=opus",
+            "Accept": "application/json",
+            "Authorization": f"Bearer {token}"
+        }
+
+        try:
+            response = _http.post(
+                url, verify=False, params=params, headers=headers, data=ogg_data,
+                timeout=settings.STT_DEADLINE_IN_SECONDS
+            )
+        except requests.RequestException as e:
+            LOGGER.error("Salute speech is unreachable", url=url, error=str(e))
+            raise RecognitionError(url, params, "Salute speech is unreachable") from e
+
+        if response.status_code != 200:
+            LOGGER.error("Salute speech went wrong!", url=url, params=params)
+            raise RecognitionError(url, params, "Salute speech went wrong!")
 
-    params = {
-        "enable_profanity_filter": False
-    }
-    headers = {
-        "Content-Type": "audio/ogg;codecs=opus",
-        "Accept": "application/json",
-        "Authorization": f"Bearer {token}"
-    }
+        return response.json()["result"]
 
-    response = requests.post(
-        url, verify=False, params=params, headers=headers, data=ogg_data
-    )
-    if response.status_code != 200:
-        LOGGER.error("Salute speech went wrong!", url=url, params=params)
-        raise RecognitionError(url, params, "Salute speech went wrong!")
 
-    return response.json()["result"]
+speech_recognizer = SpeechRecognizer()
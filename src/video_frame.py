@@ -1,8 +1,15 @@
 import os
-from typing import Self
+import select
+import subprocess
+from io import FileIO
+from time import monotonic
+from typing import IO, Self, cast
 from types import TracebackType
+from tempfile import TemporaryFile
 from pathlib import Path
-from functools import cached_property
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import cache, cached_property
 
 import structlog
 import cv2
@@ -11,31 +18,72 @@ import ffmpeg
 
 from cv2.typing import MatLike
 
-from src.speech_recognition import get_speech
 from src.core.config import settings
+from src.core.exceptions import StageTimeoutError
+from src.speech_recognition import SpeechRecognizer, speech_recognizer
 
 
 LOGGER = structlog.get_logger(__name__)
 
 
+@cache
+def _probe(path: Path) -> tuple[int, float]:
+    """Frame count and fps of a single file, probed once per process."""
+    video_capture = cv2.VideoCapture(path)
+    if not video_capture.isOpened():
+        LOGGER.error(f"Could not open video file", video_file=path)
+        raise Exception("Could not open video file")
+
+    frame_count = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = video_capture.get(cv2.CAP_PROP_FPS)
+    video_capture.release()
+
+    return frame_count, fps
+
+
 class Video:
+    """
+    Ordered playlist of video files exposed as one global frame timeline.
+    """
+
     Picture = MatLike
 
+    MAX_OPEN_DECODERS = 3
+
+    # Scanning only decides whether a frame is similar to the last posted one,
+    # so it works on tiny grayscale frames instead of full resolution ones
+    SCAN_WIDTH = 160
+    SCAN_HEIGHT = 90
+    # Reading ahead is cheaper than restarting ffmpeg for short forward jumps
+    SCAN_MAX_SKIP_FRAMES = 50
+
     @cached_property
-    def frame_count(self) -> int:
-        length = int(self.video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-        return length
+    def frame_offsets(self) -> list[int]:
+        """Global index of the first frame of every file, plus the total."""
+        offsets = [0]
+        for path in self.paths:
+            frame_count, _ = _probe(path)
+            offsets.append(offsets[-1] + frame_count)
+        return offsets
 
     @cached_property
-    def fps(self) -> int:
-        fps = int(self.video_capture.get(cv2.CAP_PROP_FPS))
-        return fps
-
-    def __init__(self, path: Path) -> None:
-        self.video_capture = cv2.VideoCapture(path)
-        if not self.video_capture.isOpened():
-            LOGGER.error(f"Could not open video file", video_file=settings.VIDEO_FILE_PATH)
-            raise Exception("Could not open video file")
+    def frame_count(self) -> int:
+        return self.frame_offsets[-1]
+
+    def __init__(self, paths: Path | list[Path]) -> None:
+        self.paths = [paths] if isinstance(paths, Path) else list(paths)
+        if not self.paths:
+            raise ValueError("Playlist is empty")
+
+        self._decoders: OrderedDict[int, cv2.VideoCapture] = OrderedDict()
+
+        self._scanner: subprocess.Popen[bytes] | None = None
+        # Scanner errors go to a file, a pipe nobody reads could stall ffmpeg
+        self._scanner_log: IO[bytes] | None = None
+        self._scanner_file = -1
+        self._scanner_next = -1
+        self._thumbnail = np.empty((self.SCAN_HEIGHT, self.SCAN_WIDTH), dtype=np.uint8)
+        LOGGER.info("Playlist loaded", files=len(self.paths), total_frames=self.frame_count)
 
     def __enter__(self) -> Self:
         return self
@@ -46,11 +94,161 @@ class Video:
         value: BaseException | None,
         traceback: TracebackType | None,
     ) -> bool | None:
-        self.video_capture.release()
+        self.close()
+
+    def close(self) -> None:
+        for video_capture in self._decoders.values():
+            video_capture.release()
+        self._decoders.clear()
+        self._close_scanner()
+
+    def _close_scanner(self) -> None:
+        if self._scanner is None:
+            return
+
+        self._scanner.kill()
+        _ = self._scanner.wait()
+        if self._scanner.stdout is not None:
+            self._scanner.stdout.close()
+        self._scanner = None
+        self._scanner_file = self._scanner_next = -1
+
+        if self._scanner_log is not None:
+            self._scanner_log.close()
+            self._scanner_log = None
+
+    def _scanner_errors(self) -> str:
+        if self._scanner_log is None:
+            return ""
+
+        _ = self._scanner_log.seek(0)
+        return self._scanner_log.read().decode(errors="replace")
+
+    def _open_scanner(self, file: int, local_index: int) -> None:
+        self._close_scanner()
+
+        path = self.paths[file]
+        _, fps = _probe(path)
+        # Half a frame earlier so rounding never drops the requested frame
+        start = max(local_index - 0.5, 0) / fps
+
+        args = cast(list[str], (
+            ffmpeg  # pyright: ignore
+            .input(str(path), ss=start)
+            .video
+            .filter('scale', self.SCAN_WIDTH, self.SCAN_HEIGHT, flags='area')
+            # Passthrough keeps ffmpeg from duplicating the first frame after the seek
+            .output('pipe:', format='rawvideo', pix_fmt='gray', fps_mode='passthrough')
+            .global_args('-loglevel', 'error', '-nostdin')
+            .compile()
+        ))
+        self._scanner_log = TemporaryFile()
+        # Unbuffered, so select sees every byte ffmpeg has written
+        self._scanner = subprocess.Popen(
+            args,
+            bufsize=0,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=self._scanner_log
+        )
+        self._scanner_file = file
+        self._scanner_next = local_index
+
+    def get_thumbnail_by_index(self, index: int) -> Picture:
+        """
+        Small grayscale version of the frame, decoded sequentially through an
+        ffmpeg rawvideo pipe. The returned array is reused by the next call,
+        copy it to keep it.
+        """
+        file, local_index = self.locate(index)
+
+        skip = local_index - self._scanner_next
+        if file != self._scanner_file or not 0 <= skip <= self.SCAN_MAX_SKIP_FRAMES:
+            self._open_scanner(file, local_index)
+
+        if self._scanner is None or self._scanner.stdout is None:
+            raise Exception("Scanner is not running")
+
+        # Popen opens the pipe with bufsize=0, so stdout is a raw FileIO
+        stdout = cast(FileIO, self._scanner.stdout)
+        deadline = monotonic() + settings.FFMPEG_DEADLINE_IN_SECONDS
+        while self._scanner_next <= local_index:
+            try:
+                scanned = self._read_scanned_frame(stdout, deadline)
+            except StageTimeoutError:
+                LOGGER.error(
+                    "Scanner missed its deadline",
+                    frame_index=index,
+                    deadline=settings.FFMPEG_DEADLINE_IN_SECONDS
+                )
+                self._close_scanner()
+                raise
+
+            if not scanned:
+                LOGGER.error(
+                    "Could not scan frame",
+                    frame_index=index,
+                    total_frames=self.frame_count,
+                    video_file=self.paths[file],
+                    stderr=self._scanner_errors()
+                )
+                self._close_scanner()
+                raise Exception("Could not scan frame")
+            self._scanner_next += 1
+
+        return self._thumbnail
+
+    def _read_scanned_frame(self, stdout: FileIO, deadline: float) -> bool:
+        """Fill the thumbnail with the next piped frame, False if the pipe ended early."""
+        buffer = memoryview(self._thumbnail).cast("B")
+        filled = 0
+        while filled < len(buffer):
+            ready, _, _ = select.select([stdout], [], [], max(deadline - monotonic(), 0))
+            if not ready:
+                raise StageTimeoutError("scanner", settings.FFMPEG_DEADLINE_IN_SECONDS)
+
+            read = stdout.readinto(buffer[filled:])
+            if not read:
+                return False
+            filled += read
+
+        return True
+
+    def locate(self, index: int) -> tuple[int, int]:
+        """Map a global frame index to (file number, local frame index)."""
+        if not 0 <= index < self.frame_count:
+            raise IndexError(f"Frame {index} is out of range 0..{self.frame_count}")
+
+        file = bisect_right(self.frame_offsets, index) - 1
+        return file, index - self.frame_offsets[file]
+
+    def _decoder(self, file: int) -> cv2.VideoCapture:
+        video_capture = self._decoders.get(file)
+        if video_capture is not None:
+            self._decoders.move_to_end(file)
+            return video_capture
+
+        path = self.paths[file]
+        video_capture = cv2.VideoCapture(path)
+        if not video_capture.isOpened():
+            LOGGER.error(f"Could not open video file", video_file=path)
+            raise Exception("Could not open video file")
+
+        self._decoders[file] = video_capture
+        if len(self._decoders) > self.MAX_OPEN_DECODERS:
+            _, evicted = self._decoders.popitem(last=False)
+            evicted.release()
+
+        return video_capture
 
     def get_frame_by_index(self, index: int) -> Picture:
-        _ = self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, index)
-        ret, frame = self.video_capture.read()
+        file, local_index = self.locate(index)
+        video_capture = self._decoder(file)
+
+        # Sequential reads continue from the current position without seeking
+        if int(video_capture.get(cv2.CAP_PROP_POS_FRAMES)) != local_index:
+            _ = video_capture.set(cv2.CAP_PROP_POS_FRAMES, local_index)
+        ret, frame = video_capture.read()
 
         if ret:
             LOGGER.info(
@@ -62,28 +260,35 @@ class Video:
                 "Could not read frame",
                 frame_index=index,
                 total_frames=self.frame_count,
-                video_file=settings.VIDEO_FILE_PATH
+                video_file=self.paths[file]
             )
             raise Exception("Could not read frame")
 
         return frame
 
+    def audio_segments(self, start: int, stop: int) -> list[tuple[Path, float, float]]:
+        """
+        Split the global frame range [start, stop) into (path, start, duration)
+        pieces in seconds, one per file it touches.
+        """
+        start, stop = max(start, 0), min(stop, self.frame_count)
+
+        segments: list[tuple[Path, float, float]] = []
+        while start < stop:
+            file, local_start = self.locate(start)
+            local_stop = min(stop, self.frame_offsets[file + 1]) - self.frame_offsets[file]
+            _, fps = _probe(self.paths[file])
+
+            segments.append((self.paths[file], local_start / fps, (local_stop - local_start) / fps))
+            start = self.frame_offsets[file] + local_stop
+
+        return segments
+
     def save_frame_into_file(self, *, path: Path, frame: MatLike) -> None:
         LOGGER.info("Frame saved as file")
 
         _ = cv2.imwrite(path, frame)
 
-    def read_frame(self, *, path: Path) -> Picture:
-        mat = cv2.imread(path)
-        if mat is None:
-            LOGGER.error(
-                "Wrong path or file doesn't exist",
-                filepath=settings.FRAME_OUTPUT_PATH
-            )
-            raise Exception("Wrong path or file doesn't exist")
-
-        return mat
-
 
 def image_difference(m1: MatLike, m2: MatLike) -> float:
     res = cv2.absdiff(m1, m2)
@@ -98,17 +303,41 @@ def does_file_exist(p: Path) -> bool:
     return os.path.exists(p)
 
 
-def get_speech_from_video(*, prev_frame: int, newest_frame: int, fps: int) -> str | None:
+def get_speech_from_video(
+    *,
+    video: Video,
+    prev_frame: int,
+    newest_frame: int,
+    speech_recognizer: SpeechRecognizer = speech_recognizer
+) -> str | None:
+    audio = [
+        ffmpeg  # pyright: ignore
+        .input(path)
+        .audio
+        .filter('atrim', start=start, duration=duration)
+        .filter('asetpts', 'PTS-STARTPTS')
+        for path, start, duration in video.audio_segments(prev_frame, newest_frame)
+    ]
+    if not audio:
+        return None
+    if len(audio) > 1:  # pyright: ignore[reportUnknownArgumentType]
+        audio = [ffmpeg.concat(*audio, v=0, a=1)]  # pyright: ignore
+
+    process = cast(subprocess.Popen[bytes], (
+        audio[0]  # pyright: ignore
+        .output('pipe:', format='ogg', acodec='libopus')
+        .run_async(pipe_stdout=True, pipe_stderr=True, quiet=True)
+    ))
     try: 
-        out, _ = (
-            ffmpeg  # pyright: ignore
-            .input(settings.VIDEO_FILE_PATH)
-            .audio
-            .filter('atrim', start=(prev_frame / fps), duration=(newest_frame - prev_frame)/fps)
-            .output('pipe:', format='ogg', acodec='libopus')
-            .run(capture_stdout=True, capture_stderr=True, quiet=True)
-        )
-    except ffmpeg.Error:
-        LOGGER.exception("Ffmpeg went wrong")
-    else:
-        return "".join(get_speech(ogg_data=out))  # pyright: ignore
+        out, err = process.communicate(timeout=settings.FFMPEG_DEADLINE_IN_SECONDS)
+    except subprocess.TimeoutExpired as e:
+        LOGGER.error("Ffmpeg missed its deadline", deadline=settings.FFMPEG_DEADLINE_IN_SECONDS)
+        process.kill()
+        _ = process.communicate()
+        raise StageTimeoutError("ffmpeg", settings.FFMPEG_DEADLINE_IN_SECONDS) from e
+
+    if process.returncode != 0:
+        LOGGER.error("Ffmpeg went wrong", stderr=err.decode(errors="replace"))
+        return None
+
+    return "".join(speech_recognizer.get_speech(ogg_data=out))
@@ -1,45 +1,115 @@
+from typing import Any, cast, override
+from threading import Lock
+
 import structlog
+from requests import PreparedRequest, ReadTimeout, Response
+from requests.adapters import HTTPAdapter
 from vk_api import VkApi, VkUpload
 
 from src.core.config import settings
-from src.core.exceptions import VkConnectionError
+from src.core.exceptions import StageTimeoutError, VkConnectionError
+from src.core.supervisor import Supervisor
 
 
 LOGGER = structlog.get_logger(__name__)
 
 
 _session: VkApi | None = None
+_session_lock = Lock()
+_supervisor = Supervisor("vk")
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    vk_api never passes a timeout, so every request gets one. Connecting and
+    reading together give up well before the stage deadline, otherwise a
+    late wall.post could still publish from a worker the supervisor has
+    already abandoned.
+    """
+
+    @override
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (settings.VK_DEADLINE_IN_SECONDS / 4, settings.VK_DEADLINE_IN_SECONDS / 2)
+        return super().send(request, *args, **kwargs)
 
 
 def _get_session() -> VkApi:
+    """One VK session with a connection pool shared by every channel."""
     global _session
-    if _session is None:
-        _session = VkApi(token=settings.VK_USER_TOKEN)
+    with _session_lock:
+        if _session is None:
+            _session = VkApi(token=settings.VK_USER_TOKEN)
+            adapter = _TimeoutHTTPAdapter(pool_maxsize=settings.WORKERS)
+            _ = _session.http.mount("https://", adapter)  # pyright: ignore[reportUnknownMemberType]
+            _ = _session.http.mount("http://", adapter)  # pyright: ignore[reportUnknownMemberType]
     return _session
 
 
-def wall_post(*, msg: str, attachments: str) -> None:
-    try:
-        _get_session().method(  # pyright: ignore[reportUnknownMemberType]
-            "wall.post",
-            {"owner_id": settings.VK_GROUP_ID, "message": msg, "attachments": attachments}
+class VkWall:
+    # How far back has_post looks, deferred posts never get buried deeper
+    RECENT_POSTS = 20
+
+    def __init__(self, group_id: int = settings.VK_GROUP_ID) -> None:
+        self.group_id = group_id
+
+    def wall_post(self, *, msg: str, attachments: str) -> None:
+        _supervisor.run(
+            self._wall_post, msg, attachments,
+            deadline=settings.VK_DEADLINE_IN_SECONDS
         )
-    except Exception as e:
-        raise VkConnectionError("Connection pool error") from e
 
+    def upload_photo(self, direc: str) -> list[str]:
+        return _supervisor.run(
+            self._upload_photo, direc,
+            deadline=settings.VK_DEADLINE_IN_SECONDS
+        )
 
-def upload_photo(direc: str) -> list[str]:
-    try:
-        upload = VkUpload(_get_session())
-        temp = upload.photo_wall(  # pyright: ignore[reportUnknownMemberType]
-            direc,
-            group_id=-settings.VK_GROUP_ID
+    def has_post(self, msg: str) -> bool:
+        return _supervisor.run(
+            self._has_post, msg,
+            deadline=settings.VK_DEADLINE_IN_SECONDS
         )
 
-        ret: list[str] = []
-        for photo in temp:
-            ret.append("photo" + str(photo["owner_id"]) + "_" + str(photo["id"]))
+    def _wall_post(self, msg: str, attachments: str) -> None:
+        try:
+            _get_session().method(  # pyright: ignore[reportUnknownMemberType]
+                "wall.post",
+                {"owner_id": self.group_id, "message": msg, "attachments": attachments}
+            )
+        except ReadTimeout as e:
+            # The request was sent, VK may have published it anyway
+            raise StageTimeoutError("vk", settings.VK_DEADLINE_IN_SECONDS) from e
+        except Exception as e:
+            raise VkConnectionError("Connection pool error") from e
+
+    def _has_post(self, msg: str) -> bool:
+        try:
+            wall: dict[str, Any] = _get_session().method(  # pyright: ignore[reportUnknownMemberType]
+                "wall.get",
+                {"owner_id": self.group_id, "count": self.RECENT_POSTS}
+            )
+        except Exception as e:
+            raise VkConnectionError("Connection pool error") from e
+
+        posts = cast(list[dict[str, Any]], wall["items"])
+        return any(post.get("text") == msg for post in posts)
+
+    def _upload_photo(self, direc: str) -> list[str]:
+        try:
+            upload = VkUpload(_get_session())
+            temp = upload.photo_wall(  # pyright: ignore[reportUnknownMemberType]
+                direc,
+                group_id=-self.group_id
+            )
+
+            ret: list[str] = []
+            for photo in temp:
+                ret.append("photo" + str(photo["owner_id"]) + "_" + str(photo["id"]))
+
+            return ret
+        except Exception as e:
+            raise VkConnectionError("Connection pool error") from e
+
 
-        return ret
-    except Exception as e:
-        raise VkConnectionError("Connection pool error") from e
+vk_wall = VkWall()
@@ -0,0 +1,69 @@
+import shutil
+from pathlib import Path
+from collections.abc import Iterator
+
+import pytest
+import ffmpeg
+
+from src.core.config import settings
+from src.video_frame import Video
+
+
+VIDEO_DURATION_IN_SECONDS = 300
+VIDEO_SIZE = "1280x720"
+VIDEO_FPS = 25
+
+RUSSIAN_CAPTION = (
+    "Слушай, ну я же тебе сто раз говорил, что борщ надо варить на говяжьем бульоне, "
+    "а не на этом твоём кубике, который ты опять купил в ларьке возле метро. "
+    "Шеф придёт через пятнадцать минут, а у нас ещё картошка не почищена, "
+    "лук не пожарен и свёкла лежит в холодильнике нетронутая. "
+    "Давай быстрее, пока Виктор Баринов не увидел, что здесь творится"
+)
+
+
+@pytest.fixture(scope="session")
+def video_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg binary is required to generate synthetic media")
+
+    path = tmp_path_factory.mktemp("media") / "synthetic.mp4"
+    video = ffmpeg.input(  # pyright: ignore
+        f"testsrc2=size={VIDEO_SIZE}:rate={VIDEO_FPS}",
+        f="lavfi",
+        t=VIDEO_DURATION_IN_SECONDS
+    )
+    audio = ffmpeg.input(  # pyright: ignore
+        "sine=frequency=440:sample_rate=48000",
+        f="lavfi",
+        t=VIDEO_DURATION_IN_SECONDS
+    )
+    _ = (
+        ffmpeg  # pyright: ignore
+        .output(
+            video, audio, str(path),
+            vcodec="libx264", preset="ultrafast", pix_fmt="yuv420p",
+            g=VIDEO_FPS * 10, acodec="aac"
+        )
+        .run(quiet=True, overwrite_output=True)
+    )
+    return path
+
+
+@pytest.fixture(scope="session")
+def video(video_path: Path) -> Iterator[Video]:
+    with Video(video_path) as v:
+        yield v
+
+
+@pytest.fixture
+def font_path() -> Path:
+    if not settings.IMPACT_FONT_PATH.exists():
+        pytest.skip("IMPACT_FONT_PATH doesn't exist")
+    return settings.IMPACT_FONT_PATH
+
+
+@pytest.fixture(scope="session")
+def playlist(video_path: Path) -> Iterator[Video]:
+    with Video([video_path, video_path, video_path]) as v:
+        yield v
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+from PIL import ImageFont
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.image import ImageTextComposer
+
+from .fixtures import *
+
+
+pytestmark = pytest.mark.benchmark
+
+
+CAPTION_WIDTH = 1280
+
+
+class TestCaption:
+    def test_optimal_font_for_lines(self, benchmark: BenchmarkFixture, font_path: Path):
+        composer = ImageTextComposer(font_path=font_path)
+
+        _ = benchmark(
+            composer._optimal_font_for_lines,  # pyright: ignore[reportPrivateUsage]
+            RUSSIAN_CAPTION,
+            CAPTION_WIDTH,
+            ImageTextComposer.MAX_ALLOWED_LINES
+        )
+
+    def test_wrap_text_to_width(self, benchmark: BenchmarkFixture, font_path: Path):
+        font = ImageFont.truetype(str(font_path), ImageTextComposer.MAX_FONT_SIZE)
+
+        _ = benchmark(
+            ImageTextComposer._wrap_text_to_width,  # pyright: ignore[reportPrivateUsage]
+            RUSSIAN_CAPTION * 4,
+            font,
+            CAPTION_WIDTH
+        )
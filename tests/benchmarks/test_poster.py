@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.poster import Poster
+from src.speech_recognition import SpeechRecognizer
+from src.simulation.app_data import InMemoryAppData
+from src.simulation.vk import VkRecorder
+
+from .fixtures import *
+
+
+pytestmark = pytest.mark.benchmark
+
+
+class TestPoster:
+    def test_post_next(
+        self,
+        benchmark: BenchmarkFixture,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        video_path: Path,
+        font_path: Path
+    ):
+        monkeypatch.setattr(SpeechRecognizer, "get_speech", lambda self, *, ogg_data: [RUSSIAN_CAPTION])  # pyright: ignore
+        # Every round posts the next frame instead of scanning to the next scene change
+        monkeypatch.setattr("src.poster.image_difference", lambda m1, m2: 0.0)  # pyright: ignore
+
+        poster = Poster(
+            video_paths=[video_path],
+            output_path=tmp_path / "frame.jpg",
+            second_output_path=tmp_path / "changed.jpg",
+            font_path=font_path,
+            delay_in_seconds=0,
+            app_data=InMemoryAppData(frame_index=1000),
+            vk_wall=VkRecorder()
+        )
+
+        _ = benchmark.pedantic(poster.post_next, rounds=20)
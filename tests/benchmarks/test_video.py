@@ -0,0 +1,107 @@
+import random
+from itertools import count
+
+import numpy as np
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.speech_recognition import SpeechRecognizer
+from src.video_frame import Video, image_difference, get_speech_from_video
+
+from .fixtures import *
+
+
+pytestmark = pytest.mark.benchmark
+
+
+SPEECH_WINDOW_IN_FRAMES = 500
+
+
+class TestFrameLookup:
+    def test_random_access(self, benchmark: BenchmarkFixture, video: Video):
+        rng = random.Random(0)
+
+        def setup():
+            return (rng.randrange(video.frame_count),), {}
+
+        _ = benchmark.pedantic(video.get_frame_by_index, setup=setup, rounds=50)
+
+    def test_random_access_playlist(self, benchmark: BenchmarkFixture, playlist: Video):
+        rng = random.Random(0)
+
+        def setup():
+            return (rng.randrange(playlist.frame_count),), {}
+
+        _ = benchmark.pedantic(playlist.get_frame_by_index, setup=setup, rounds=50)
+
+    def test_sequential_access(self, benchmark: BenchmarkFixture, video: Video):
+        indices = count(video.frame_count // 2)
+
+        def setup():
+            return (next(indices),), {}
+
+        _ = benchmark.pedantic(video.get_frame_by_index, setup=setup, rounds=200)
+
+    def test_sequential_scan(self, benchmark: BenchmarkFixture, video: Video):
+        indices = count(video.frame_count // 2)
+
+        def setup():
+            return (next(indices),), {}
+
+        _ = benchmark.pedantic(video.get_thumbnail_by_index, setup=setup, rounds=200)
+
+
+@pytest.mark.parametrize(
+    "resolution",
+    [(360, 640, 3), (720, 1280, 3), (1080, 1920, 3), (Video.SCAN_HEIGHT, Video.SCAN_WIDTH)],
+    ids=["360p", "720p", "1080p", "scan"]
+)
+def test_image_difference(benchmark: BenchmarkFixture, resolution: tuple[int, ...]):
+    rng = np.random.default_rng(0)
+    m1 = rng.integers(0, 256, size=resolution, dtype=np.uint8)
+    m2 = rng.integers(0, 256, size=resolution, dtype=np.uint8)
+
+    _ = benchmark(image_difference, m1, m2)
+
+
+@pytest.mark.parametrize("depth", [0.1, 0.5, 0.9], ids=["start", "middle", "end"])
+def test_speech_extraction(
+    benchmark: BenchmarkFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    video: Video,
+    depth: float
+):
+    monkeypatch.setattr(SpeechRecognizer, "get_speech", lambda self, *, ogg_data: [""])  # pyright: ignore
+
+    newest_frame = int(video.frame_count * depth)
+    _ = benchmark.pedantic(
+        get_speech_from_video,
+        kwargs={
+            "video": video,
+            "prev_frame": newest_frame - SPEECH_WINDOW_IN_FRAMES,
+            "newest_frame": newest_frame
+        },
+        rounds=5
+    )
+
+
+def test_speech_extraction_across_files(
+    benchmark: BenchmarkFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    playlist: Video
+):
+    monkeypatch.setattr(SpeechRecognizer, "get_speech", lambda self, *, ogg_data: [""])  # pyright: ignore
+
+    boundary = playlist.frame_offsets[1]
+    assert playlist.locate(boundary) == (1, 0)
+    assert len(playlist.audio_segments(boundary - 250, boundary + 250)) == 2
+
+    _ = benchmark.pedantic(
+        get_speech_from_video,
+        kwargs={
+            "video": playlist,
+            "prev_frame": boundary - SPEECH_WINDOW_IN_FRAMES // 2,
+            "newest_frame": boundary + SPEECH_WINDOW_IN_FRAMES // 2
+        },
+        rounds=5
+    )
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+
+from src.core.config import ChannelSettings, settings
+
+
+class TestChannels:
+    def test_single_channel_fallback(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(settings, "CHANNELS", [])
+        monkeypatch.setattr(settings, "PLAYLIST", [])
+        monkeypatch.setattr(settings, "VIDEO_FILE_PATH", Path("kuhnya.mp4"))
+
+        [channel] = settings.channels
+
+        assert channel.name == settings.APP_NAME
+        assert channel.vk_group_id == settings.VK_GROUP_ID
+        assert channel.initial_frame == settings.INITIAL_FRAME
+        assert channel.post_delay_in_seconds == settings.POST_DELAY_IN_SECONDS
+        assert channel.playlist == [Path("kuhnya.mp4")]
+        assert channel.frame_output_path == settings.FRAME_OUTPUT_PATH
+        assert channel.changed_output_path == settings.CHANGED_OUTPUT_PATH
+
+    def test_playlist_overrides_video_file(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(settings, "CHANNELS", [])
+        monkeypatch.setattr(settings, "PLAYLIST", [Path("s01e01.mp4"), Path("s01e02.mp4")])
+        monkeypatch.setattr(settings, "VIDEO_FILE_PATH", Path("kuhnya.mp4"))
+
+        [channel] = settings.channels
+
+        assert channel.playlist == [Path("s01e01.mp4"), Path("s01e02.mp4")]
+
+    def test_configured_channels(self, monkeypatch: pytest.MonkeyPatch):
+        channels = [
+            ChannelSettings(
+                name=name,
+                vk_group_id=-i,
+                playlist=[Path(f"{name}.mp4")],
+                frame_output_path=Path(f"{name}.jpg"),
+                changed_output_path=Path(f"{name}_text.jpg")
+            )
+            for i, name in enumerate(["first", "second"], start=1)
+        ]
+        monkeypatch.setattr(settings, "CHANNELS", channels)
+
+        assert settings.channels == channels
+
+    def test_no_video(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(settings, "CHANNELS", [])
+        monkeypatch.setattr(settings, "PLAYLIST", [])
+        monkeypatch.setattr(settings, "VIDEO_FILE_PATH", None)
+
+        with pytest.raises(ValueError):
+            _ = settings.channels
@@ -0,0 +1,30 @@
+from time import sleep
+
+import pytest
+
+from src.core.exceptions import StageTimeoutError
+from src.core.supervisor import Supervisor
+
+
+class TestSupervisor:
+    def test_returns_result(self):
+        supervisor = Supervisor("test", workers=1)
+
+        assert supervisor.run(sum, [1, 2, 3], deadline=1) == 6
+
+    def test_propagates_errors(self):
+        supervisor = Supervisor("test", workers=1)
+
+        with pytest.raises(ZeroDivisionError):
+            _ = supervisor.run(divmod, 1, 0, deadline=1)
+
+    def test_restarts_hung_worker(self):
+        supervisor = Supervisor("test", workers=1)
+        executor = supervisor.executor
+
+        with pytest.raises(StageTimeoutError):
+            supervisor.run(sleep, 0.5, deadline=0.05)
+
+        assert supervisor.executor is not executor
+        # The only worker of the old pool is still sleeping, the new one answers
+        assert supervisor.run(sum, [1], deadline=0.1) == 1
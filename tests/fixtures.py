@@ -0,0 +1,39 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import ffmpeg
+
+
+NOISE_VIDEO_SIZE = "320x180"
+NOISE_VIDEO_FPS = 25
+NOISE_VIDEO_DURATION_IN_SECONDS = 20
+
+
+@pytest.fixture(scope="session")
+def noise_video_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Losslessly encoded grayscale noise, so every frame differs from its neighbours."""
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg binary is required to generate synthetic media")
+
+    path = tmp_path_factory.mktemp("media") / "noise.mp4"
+    video = ffmpeg.input(  # pyright: ignore
+        f"nullsrc=size={NOISE_VIDEO_SIZE}:rate={NOISE_VIDEO_FPS},geq=lum='random(1)*255':cb=128:cr=128",
+        f="lavfi",
+        t=NOISE_VIDEO_DURATION_IN_SECONDS
+    )
+    audio = ffmpeg.input(  # pyright: ignore
+        "sine=frequency=440:sample_rate=48000",
+        f="lavfi",
+        t=NOISE_VIDEO_DURATION_IN_SECONDS
+    )
+    _ = (
+        ffmpeg  # pyright: ignore
+        .output(
+            video, audio, str(path),
+            vcodec="libx264", preset="ultrafast", qp=0, pix_fmt="yuv420p",
+            g=NOISE_VIDEO_FPS, acodec="aac"
+        )
+        .run(quiet=True, overwrite_output=True)
+    )
+    return path
@@ -0,0 +1,62 @@
+from pathlib import Path
+from collections.abc import Callable, Iterator
+
+import pytest
+
+from src.core.config import settings
+from src.poster import Poster
+from src.simulation.app_data import InMemoryAppData
+from src.simulation.clock import VirtualClock
+from src.simulation.vk import VkRecorder
+
+from tests.fixtures import noise_video_path  # pyright: ignore[reportUnusedImport]
+
+
+@pytest.fixture
+def clock() -> VirtualClock:
+    return VirtualClock()
+
+
+@pytest.fixture
+def app_data(clock: VirtualClock) -> InMemoryAppData:
+    return InMemoryAppData(clock=clock, frame_index=10)
+
+
+@pytest.fixture
+def vk(clock: VirtualClock) -> VkRecorder:
+    return VkRecorder(clock=clock)
+
+
+@pytest.fixture
+def create_poster(
+    tmp_path: Path,
+    noise_video_path: Path,
+    app_data: InMemoryAppData,
+    vk: VkRecorder,
+    clock: VirtualClock
+) -> Iterator[Callable[[], Poster]]:
+    posters: list[Poster] = []
+
+    def create() -> Poster:
+        poster = Poster(
+            video_paths=[noise_video_path],
+            output_path=tmp_path / "frame.jpg",
+            second_output_path=tmp_path / "changed.jpg",
+            font_path=settings.IMPACT_FONT_PATH,
+            delay_in_seconds=1800,
+            app_data=app_data,
+            vk_wall=vk,
+            clock=clock
+        )
+        posters.append(poster)
+        return poster
+
+    yield create
+
+    for poster in posters:
+        poster.close()
+
+
+@pytest.fixture
+def no_speech(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("src.poster.get_speech_from_video", lambda **kwargs: None)  # pyright: ignore
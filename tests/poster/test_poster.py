@@ -0,0 +1,286 @@
+import subprocess
+from typing import Any
+from pathlib import Path
+from threading import current_thread
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.config import settings
+from src.core.exceptions import RecognitionError, StageTimeoutError
+from src.poster import Poster
+from src.speech_recognition import SpeechRecognizer
+from src.video_frame import Video, get_speech_from_video
+from src.simulation.vk import VkRecorder
+
+from .fixtures import *
+
+
+@pytest.mark.usefixtures("no_speech")
+class TestSimilarity:
+    def test_posts_every_distinct_frame(self, create_poster: Callable[[], Poster], vk: VkRecorder):
+        poster = create_poster()
+
+        for _ in range(3):
+            poster.post_next()
+
+        assert [post.msg.split()[0] for post in vk.posts] == ["10", "11", "12"]
+
+    def test_restart_compares_with_last_posted_frame(
+        self,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        create_poster().post_next()
+        create_poster().post_next()
+
+        assert [post.msg.split()[0] for post in vk.posts] == ["10", "11"]
+
+    def test_skips_similar_frames(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        similarity = iter([10.0, 1.0])
+        monkeypatch.setattr("src.poster.image_difference", lambda m1, m2: next(similarity))  # pyright: ignore
+        poster = create_poster()
+
+        poster.post_next()
+        poster.post_next()
+
+        assert [post.msg.split()[0] for post in vk.posts] == ["10", "12"]
+
+    def test_tolerates_more_similarity_without_speech(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        def fail(**kwargs: Any):
+            raise RecognitionError("url", {}, "No tokens left")
+
+        monkeypatch.setattr("src.poster.get_speech_from_video", fail)
+        monkeypatch.setattr("src.poster.image_difference", lambda m1, m2: 10.0)  # pyright: ignore
+        poster = create_poster()
+
+        poster.post_next()
+        poster.post_next()
+
+        assert [post.msg.split()[0] for post in vk.posts] == ["10", "11"]
+
+
+@pytest.mark.usefixtures("no_speech")
+class TestRetryQueue:
+    def test_deferred_post_goes_out_before_next_frame(
+        self,
+        tmp_path: Path,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        poster = create_poster()
+
+        vk.failure_rate = 1
+        poster.post_next()
+        assert [post.msg for post in poster.pending_posts] == ["10 из 500 кадров"]
+        assert poster.seconds_until_next_post() == Poster.RETRY_DELAY_IN_SECONDS
+
+        vk.failure_rate = 0
+        poster.post_next()
+        poster.post_next()
+
+        assert [post.msg.split()[0] for post in vk.posts] == ["10", "11"]
+        assert poster.pending_posts == []
+        assert list(tmp_path.glob("*.pending*")) == []
+
+    def test_queue_survives_restart(
+        self,
+        tmp_path: Path,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        vk.failure_rate = 1
+        create_poster().post_next()
+        assert list(tmp_path.glob("*.pending*")) == [tmp_path / "frame.pending10.jpg"]
+
+        vk.failure_rate = 0
+        poster = create_poster()
+        poster.post_next()
+
+        assert [post.msg.split()[0] for post in vk.posts] == ["10"]
+        assert poster.pending_posts == []
+        assert list(tmp_path.glob("*.pending*")) == []
+
+    def test_rejected_post_dropped_after_max_attempts(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        monkeypatch.setattr(Poster, "MAX_POST_ATTEMPTS", 3)
+        poster = create_poster()
+
+        vk.failure_rate = 1
+        poster.post_next()
+        poster.post_next()
+        assert [post.attempts for post in poster.pending_posts] == [2]
+
+        poster.post_next()
+        assert poster.pending_posts == []
+        assert list(tmp_path.glob("*.pending*")) == []
+
+        vk.failure_rate = 0
+        poster.post_next()
+        assert [post.msg.split()[0] for post in vk.posts] == ["11"]
+
+
+class TestFallbacks:
+    def test_posts_without_caption_when_stt_times_out(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        def time_out(self: SpeechRecognizer, *, ogg_data: bytes) -> list[str]:
+            raise StageTimeoutError("stt", 30)
+
+        monkeypatch.setattr(SpeechRecognizer, "get_speech", time_out)
+        poster = create_poster()
+
+        poster.post_next()
+
+        assert [Path(upload).name for upload in vk.uploads] == ["frame.jpg"]
+        assert poster.minimal_image_difference == Poster.MINIMAL_IMAGE_DIFFERENCE_WITHOUT_SPEECH
+
+    def test_posts_without_caption_when_ffmpeg_fails(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        missing = tmp_path / "missing.mp4"
+        monkeypatch.setattr(Video, "audio_segments", lambda self, start, stop: [(missing, 0.0, 20.0)])  # pyright: ignore
+        # A caption left over from an earlier post must not be reused
+        (tmp_path / "changed.jpg").touch()
+        poster = create_poster()
+
+        poster.post_next()
+
+        assert [Path(upload).name for upload in vk.uploads] == ["frame.jpg"]
+
+    def test_ffmpeg_killed_when_it_misses_deadline(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        killed: list[subprocess.Popen[bytes]] = []
+        kill = subprocess.Popen.kill
+
+        def spy(process: subprocess.Popen[bytes]) -> None:
+            if "libopus" in process.args:  # pyright: ignore[reportOperatorIssue]
+                killed.append(process)
+            kill(process)
+
+        # Only audio extraction gets the tiny deadline, scanning keeps the default one
+        def hurried(**kwargs: Any) -> str | None:
+            with monkeypatch.context() as m:
+                m.setattr(settings, "FFMPEG_DEADLINE_IN_SECONDS", 0.001)
+                return get_speech_from_video(**kwargs)
+
+        monkeypatch.setattr(subprocess.Popen, "kill", spy)
+        monkeypatch.setattr("src.poster.get_speech_from_video", hurried)
+        poster = create_poster()
+
+        poster.post_next()
+
+        assert len(killed) == 1
+        assert killed[0].returncode is not None
+        assert [Path(upload).name for upload in vk.uploads] == ["frame.jpg"]
+
+
+@pytest.mark.usefixtures("no_speech")
+class TestCpuExecutor:
+    def test_network_waits_stay_off_cpu_pool(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        threads: dict[str, str] = {}
+        get_frame_by_index = Video.get_frame_by_index
+        upload_photo = VkRecorder.upload_photo
+
+        def decode(video: Video, index: int) -> Video.Picture:
+            threads["decode"] = current_thread().name
+            return get_frame_by_index(video, index)
+
+        def upload(recorder: VkRecorder, direc: str) -> list[str]:
+            threads["upload"] = current_thread().name
+            return upload_photo(recorder, direc)
+
+        monkeypatch.setattr(Video, "get_frame_by_index", decode)
+        monkeypatch.setattr(VkRecorder, "upload_photo", upload)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="cpu") as cpu_executor:
+            poster = create_poster()
+            poster.cpu_executor = cpu_executor
+            poster.post_next()
+
+        assert threads["decode"].startswith("cpu")
+        assert not threads["upload"].startswith("cpu")
+        assert [post.msg.split()[0] for post in vk.posts] == ["10"]
+
+
+@pytest.mark.usefixtures("no_speech")
+class TestUnknownOutcome:
+    @staticmethod
+    def time_out_once(monkeypatch: pytest.MonkeyPatch, *, published: bool) -> None:
+        wall_post = VkRecorder.wall_post
+        calls: list[str] = []
+
+        def slow_wall_post(recorder: VkRecorder, *, msg: str, attachments: str) -> None:
+            calls.append(msg)
+            if len(calls) > 1 or published:
+                wall_post(recorder, msg=msg, attachments=attachments)
+            if len(calls) == 1:
+                raise StageTimeoutError("vk", 60)
+
+        monkeypatch.setattr(VkRecorder, "wall_post", slow_wall_post)
+
+    def test_published_post_is_not_posted_twice(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        self.time_out_once(monkeypatch, published=True)
+        poster = create_poster()
+
+        poster.post_next()
+        assert [post.uncertain for post in poster.pending_posts] == [True]
+
+        poster.post_next()
+        poster.post_next()
+
+        assert [post.msg.split()[0] for post in vk.posts] == ["10", "11"]
+        assert list(tmp_path.glob("*.pending*")) == []
+
+    def test_lost_post_is_retried(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        create_poster: Callable[[], Poster],
+        vk: VkRecorder
+    ):
+        self.time_out_once(monkeypatch, published=False)
+        poster = create_poster()
+
+        poster.post_next()
+        poster.post_next()
+        poster.post_next()
+
+        assert [post.msg.split()[0] for post in vk.posts] == ["10", "11"]
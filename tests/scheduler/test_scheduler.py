@@ -0,0 +1,114 @@
+import asyncio
+from typing import Self
+from pathlib import Path
+
+import pytest
+
+from src.core.config import ChannelSettings
+from src.scheduler import Scheduler
+from src.simulation.app_data import InMemoryAppData
+
+
+class FakePoster:
+    def __init__(self, *, fail: bool, fail_delay: bool = False) -> None:
+        self.fail = fail
+        self.fail_delay = fail_delay
+        self.posts = 0
+        self.closed = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.closed = True
+
+    def post_next(self) -> None:
+        if self.fail:
+            raise Exception("Broken channel")
+        self.posts += 1
+
+    def seconds_until_next_post(self) -> float:
+        if self.fail_delay:
+            raise Exception("Mongo is unreachable")
+        return 0
+
+
+def channel(name: str) -> ChannelSettings:
+    return ChannelSettings(
+        name=name,
+        vk_group_id=-1,
+        playlist=[Path(f"{name}.mp4")],
+        frame_output_path=Path(f"{name}.jpg"),
+        changed_output_path=Path(f"{name}_text.jpg")
+    )
+
+
+def run_for(scheduler: Scheduler, seconds: float) -> None:
+    with pytest.raises(TimeoutError):
+        asyncio.run(asyncio.wait_for(scheduler.run_async(), timeout=seconds))
+
+
+class TestScheduler:
+    def test_failing_channel_does_not_stop_others(self, monkeypatch: pytest.MonkeyPatch):
+        posters = {"good": FakePoster(fail=False), "bad": FakePoster(fail=True)}
+        monkeypatch.setattr(Scheduler, "RETRY_DELAY_IN_SECONDS", 0)
+        monkeypatch.setattr(Scheduler, "_create_poster", lambda self, c: posters[c.name])  # pyright: ignore
+
+        scheduler = Scheduler([channel("good"), channel("bad")], workers=2, app_data=InMemoryAppData())
+        run_for(scheduler, 0.3)
+
+        assert posters["good"].posts > 1
+
+    def test_failing_delay_lookup_does_not_stop_others(self, monkeypatch: pytest.MonkeyPatch):
+        posters = {"good": FakePoster(fail=False), "bad": FakePoster(fail=False, fail_delay=True)}
+        monkeypatch.setattr(Scheduler, "RETRY_DELAY_IN_SECONDS", 0)
+        monkeypatch.setattr(Scheduler, "_create_poster", lambda self, c: posters[c.name])  # pyright: ignore
+
+        scheduler = Scheduler([channel("good"), channel("bad")], workers=2, app_data=InMemoryAppData())
+        run_for(scheduler, 0.3)
+
+        assert posters["good"].posts > 2
+        assert posters["bad"].posts > 2
+
+    def test_posters_closed_on_shutdown(self, monkeypatch: pytest.MonkeyPatch):
+        posters = {"first": FakePoster(fail=False), "second": FakePoster(fail=True)}
+        monkeypatch.setattr(Scheduler, "_create_poster", lambda self, c: posters[c.name])  # pyright: ignore
+
+        scheduler = Scheduler([channel("first"), channel("second")], workers=2, app_data=InMemoryAppData())
+        run_for(scheduler, 0.1)
+
+        assert all(poster.closed for poster in posters.values())
+
+    def test_channel_failing_to_start_does_not_stop_others(self, monkeypatch: pytest.MonkeyPatch):
+        good = FakePoster(fail=False)
+
+        def create_poster(self: Scheduler, c: ChannelSettings) -> FakePoster:
+            if c.name == "missing":
+                raise Exception("Could not open video file")
+            return good
+
+        monkeypatch.setattr(Scheduler, "_create_poster", create_poster)
+
+        scheduler = Scheduler([channel("missing"), channel("good")], workers=2, app_data=InMemoryAppData())
+        run_for(scheduler, 0.3)
+
+        assert good.posts > 1
+
+    def test_channel_failing_to_start_is_retried(self, monkeypatch: pytest.MonkeyPatch):
+        poster = FakePoster(fail=False)
+        attempts: list[str] = []
+
+        def create_poster(self: Scheduler, c: ChannelSettings) -> FakePoster:
+            attempts.append(c.name)
+            if len(attempts) == 1:
+                raise Exception("Could not open video file")
+            return poster
+
+        monkeypatch.setattr(Scheduler, "RETRY_DELAY_IN_SECONDS", 0)
+        monkeypatch.setattr(Scheduler, "_create_poster", create_poster)
+
+        scheduler = Scheduler([channel("flaky")], workers=1, app_data=InMemoryAppData())
+        run_for(scheduler, 0.3)
+
+        assert attempts == ["flaky", "flaky"]
+        assert poster.posts > 1
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pytest
+
+from src.core.config import settings
+from src.simulation.runner import simulate
+
+from tests.fixtures import noise_video_path  # pyright: ignore[reportUnusedImport]
+
+
+class TestSimulate:
+    def test_leaves_live_channel_and_settings_untouched(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        noise_video_path: Path
+    ):
+        monkeypatch.setattr(settings, "PLAYLIST", [noise_video_path])
+        monkeypatch.setattr(settings, "INITIAL_FRAME", 0)
+        monkeypatch.setattr(settings, "POST_DELAY_IN_SECONDS", 1800)
+        monkeypatch.setattr(settings, "FRAME_OUTPUT_PATH", tmp_path / "frame.jpg")
+        monkeypatch.setattr(settings, "CHANGED_OUTPUT_PATH", tmp_path / "changed.jpg")
+        live = settings.model_dump()
+
+        simulate(days=0.1)
+
+        assert not any(tmp_path.iterdir())
+        assert settings.model_dump() == live
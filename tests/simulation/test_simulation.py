@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.exceptions import RecognitionError
+from src.simulation.clock import VirtualClock
+from src.simulation.app_data import InMemoryAppData
+from src.simulation.speech_server import CANNED_TRANSCRIPTS, CannedSpeechServer
+from src.speech_recognition import SpeechRecognizer
+
+
+class TestVirtualClock:
+    def test_sleep_advances_time(self):
+        start = datetime(2026, 1, 1)
+        clock = VirtualClock(start)
+
+        clock.sleep(1800)
+
+        assert clock.now() == start + timedelta(minutes=30)
+        assert clock.slept_seconds == 1800
+
+    def test_app_data_uses_clock(self):
+        clock = VirtualClock(datetime(2026, 1, 1))
+        app_data = InMemoryAppData(clock=clock, frame_index=10)
+
+        clock.sleep(60)
+        app_data.increment_frame_index()
+
+        doc = app_data.get()
+        assert doc["frame_index"] == 11
+        assert doc["datetime"] == clock.now()
+
+    def test_app_data_keyed_by_channel(self):
+        app_data = InMemoryAppData(clock=VirtualClock())
+
+        _ = app_data.get("first", initial_frame=0)
+        app_data.increment_frame_index("first")
+
+        assert app_data.get("first", initial_frame=0)["frame_index"] == 2
+        assert app_data.get("second", initial_frame=100)["frame_index"] == 101
+
+
+def recognizer(server: CannedSpeechServer) -> SpeechRecognizer:
+    return SpeechRecognizer(oauth_url=server.oauth_url, recognize_url=server.recognize_url)
+
+
+class TestCannedSpeechServer:
+    def test_recognize(self):
+        with CannedSpeechServer() as server:
+            assert recognizer(server).get_speech(ogg_data=b"") == [CANNED_TRANSCRIPTS[0]]
+
+    def test_failure(self):
+        with CannedSpeechServer(failure_rate=1.0) as server:
+            with pytest.raises(RecognitionError):
+                _ = recognizer(server).get_speech(ogg_data=b"")
+            assert server.failures == 1
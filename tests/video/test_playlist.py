@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from src.video_frame import Video
+
+
+# frame count and fps of every fake file
+PROBES = {
+    Path("s01e01.mp4"): (100, 25.0),
+    Path("empty.mp4"): (0, 25.0),
+    Path("s01e02.mp4"): (50, 50.0),
+}
+
+
+@pytest.fixture
+def playlist(monkeypatch: pytest.MonkeyPatch) -> Video:
+    monkeypatch.setattr("src.video_frame._probe", PROBES.__getitem__)
+    return Video(list(PROBES))
+
+
+class TestLocate:
+    def test_offsets(self, playlist: Video):
+        assert playlist.frame_offsets == [0, 100, 100, 150]
+        assert playlist.frame_count == 150
+
+    def test_first_and_last_frame(self, playlist: Video):
+        assert playlist.locate(0) == (0, 0)
+        assert playlist.locate(149) == (2, 49)
+
+    def test_skips_empty_file(self, playlist: Video):
+        assert playlist.locate(99) == (0, 99)
+        assert playlist.locate(100) == (2, 0)
+
+    @pytest.mark.parametrize("index", [-1, 150, 1000])
+    def test_out_of_range(self, playlist: Video, index: int):
+        with pytest.raises(IndexError):
+            _ = playlist.locate(index)
+
+    def test_empty_playlist(self):
+        with pytest.raises(ValueError):
+            _ = Video([])
+
+
+class TestAudioSegments:
+    def test_inside_one_file(self, playlist: Video):
+        assert playlist.audio_segments(25, 50) == [(Path("s01e01.mp4"), 1.0, 1.0)]
+
+    def test_across_boundary(self, playlist: Video):
+        assert playlist.audio_segments(75, 125) == [
+            (Path("s01e01.mp4"), 3.0, 1.0),
+            (Path("s01e02.mp4"), 0.0, 0.5),
+        ]
+
+    def test_clamped_to_playlist(self, playlist: Video):
+        assert playlist.audio_segments(-500, 25) == [(Path("s01e01.mp4"), 0.0, 1.0)]
+        assert playlist.audio_segments(125, 1000) == [(Path("s01e02.mp4"), 0.5, 0.5)]
+
+    def test_empty_range(self, playlist: Video):
+        assert playlist.audio_segments(50, 50) == []
+        assert playlist.audio_segments(200, 300) == []
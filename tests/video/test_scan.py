@@ -0,0 +1,74 @@
+import os
+import signal
+from pathlib import Path
+from collections.abc import Iterator
+
+import cv2
+import numpy as np
+import pytest
+from cv2.typing import MatLike
+
+from src.core.config import settings
+from src.core.exceptions import StageTimeoutError
+from src.video_frame import Video
+
+from tests.fixtures import noise_video_path  # pyright: ignore[reportUnusedImport]
+
+
+@pytest.fixture
+def video(noise_video_path: Path) -> Iterator[Video]:
+    with Video(noise_video_path) as v:
+        yield v
+
+
+def downscaled(frame: MatLike) -> MatLike:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (Video.SCAN_WIDTH, Video.SCAN_HEIGHT), interpolation=cv2.INTER_AREA)
+
+
+def distance(m1: MatLike, m2: MatLike) -> float:
+    return float(np.mean(cv2.absdiff(m1, m2)))
+
+
+def assert_thumbnail_matches(video: Video, index: int) -> None:
+    thumbnail = video.get_thumbnail_by_index(index).copy()
+
+    # Scalers round differently, while any other noise frame is far away
+    assert distance(thumbnail, downscaled(video.get_frame_by_index(index))) < 5
+    for neighbour in (index - 1, index + 1):
+        if 0 <= neighbour < video.frame_count:
+            assert distance(thumbnail, downscaled(video.get_frame_by_index(neighbour))) > 20
+
+
+class TestThumbnail:
+    @pytest.mark.parametrize("start", [0, 1, 137, 300])
+    def test_fresh_seek_and_sequential_reads(self, video: Video, start: int):
+        for index in range(start, start + 5):
+            assert_thumbnail_matches(video, index)
+
+    def test_backward_and_long_jumps(self, video: Video):
+        for index in (200, 201, 50, 51, 400):
+            assert_thumbnail_matches(video, index)
+
+    def test_thumbnail_shape(self, video: Video):
+        thumbnail = video.get_thumbnail_by_index(10)
+
+        assert thumbnail.shape == (Video.SCAN_HEIGHT, Video.SCAN_WIDTH)
+        assert thumbnail.dtype == np.uint8
+
+
+class TestScannerDeadline:
+    def test_stalled_scanner_is_killed(self, monkeypatch: pytest.MonkeyPatch, video: Video):
+        _ = video.get_thumbnail_by_index(0)
+        scanner = video._scanner  # pyright: ignore[reportPrivateUsage]
+        assert scanner is not None
+
+        # A stopped ffmpeg writes nothing past what already sits in the pipe
+        os.kill(scanner.pid, signal.SIGSTOP)
+        monkeypatch.setattr(settings, "FFMPEG_DEADLINE_IN_SECONDS", 0.5)
+
+        with pytest.raises(StageTimeoutError):
+            _ = video.get_thumbnail_by_index(Video.SCAN_MAX_SKIP_FRAMES)
+
+        assert scanner.returncode is not None
+        assert_thumbnail_matches(video, Video.SCAN_MAX_SKIP_FRAMES)
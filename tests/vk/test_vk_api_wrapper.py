@@ -0,0 +1,45 @@
+from typing import Any
+
+import pytest
+from requests import PreparedRequest, ReadTimeout, Response
+from requests.adapters import HTTPAdapter
+
+from src.core.config import settings
+from src.core.exceptions import StageTimeoutError, VkConnectionError
+from src.vk_api_wrapper import VkWall, _TimeoutHTTPAdapter  # pyright: ignore[reportPrivateUsage]
+
+
+class FakeSession:
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+    def method(self, _name: str, _values: dict[str, Any]) -> Any:
+        raise self.error
+
+
+class TestTimeouts:
+    def test_requests_give_up_before_deadline(self, monkeypatch: pytest.MonkeyPatch):
+        sent: dict[str, Any] = {}
+
+        def send(_self: HTTPAdapter, _request: PreparedRequest, *_args: Any, **kwargs: Any) -> Response:
+            sent.update(kwargs)
+            return Response()
+
+        monkeypatch.setattr(HTTPAdapter, "send", send)
+
+        _ = _TimeoutHTTPAdapter().send(PreparedRequest())
+
+        connect, read = sent["timeout"]
+        assert connect + read < settings.VK_DEADLINE_IN_SECONDS
+
+    def test_wall_post_read_timeout_is_unknown_outcome(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr("src.vk_api_wrapper._get_session", lambda: FakeSession(ReadTimeout()))
+
+        with pytest.raises(StageTimeoutError):
+            VkWall(group_id=-1).wall_post(msg="10 из 500 кадров", attachments="photo-1_1")
+
+    def test_wall_post_error_is_connection_error(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr("src.vk_api_wrapper._get_session", lambda: FakeSession(Exception("Access denied")))
+
+        with pytest.raises(VkConnectionError):
+            VkWall(group_id=-1).wall_post(msg="10 из 500 кадров", attachments="photo-1_1")